@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,6 +49,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'selector.middleware.AdminConfigMiddleware',
 ]
 
 ROOT_URLCONF = 'ab_choice.urls'
@@ -128,6 +130,11 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 OPENAI_API_KEY = ''
 OPENAI_MODEL = 'gpt-4o-mini'
 
+# AdminConfig cache settings
+# Save invalidation only reaches the worker's own cache unless CACHES is shared,
+# so keep this short with the default per-process LocMemCache.
+ADMIN_CONFIG_CACHE_TIMEOUT = 5
+
 ###########################
 # Load LOCAL_SETTINGS
 ###########################
@@ -141,3 +148,23 @@ try:
             globals()[key] = value
 except ImportError:
     pass
+
+###########################
+# Test database
+###########################
+class DisableMigrations:
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+if sys.argv[1:2] == ['test']:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    }
+    MIGRATION_MODULES = DisableMigrations()
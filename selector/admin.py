@@ -1,27 +1,47 @@
+from collections import Counter
+from itertools import groupby
+
 from django.contrib import admin
-from django.db import models
-from django.db.models import Count
+from django.core.paginator import Paginator
+from django.db import connection, models
+from django.db.models import Count, OuterRef, Subquery
 from django.shortcuts import render
 from django.urls import path
 
 from selector.models import AdminConfig, Choice, Option, UserSession
 
+CHOICES_CHUNK_SIZE = 2000
+RESULTS_PER_PAGE = 100
+
 
-def _calculate_session_streak(choices):
-    current_streak = 0
-    current_option = None
+def _iter_session_streaks(rows):
+    current_session = None
     longest_streak = 0
     longest_option = None
-    for choice in choices:
-        if choice.selected == current_option:
-            current_streak += 1
-        else:
-            current_option = choice.selected
-            current_streak = 1
-        if current_streak > longest_streak:
-            longest_streak = current_streak
-            longest_option = current_option
-    return longest_option, longest_streak
+    for (session_id, selected_id), run in groupby(rows):
+        streak = len(list(run))
+        if longest_streak and session_id != current_session:
+            yield longest_option, longest_streak
+            longest_streak = 0
+        current_session = session_id
+        if streak > longest_streak:
+            longest_streak = streak
+            longest_option = selected_id
+    if longest_streak:
+        yield longest_option, longest_streak
+
+
+def _get_last_choice_per_session(choices_qs):
+    if connection.features.can_distinct_on_fields:
+        return choices_qs.order_by('session_id', '-created_at', '-id').distinct('session_id')
+    latest = choices_qs.filter(session_id=OuterRef('session_id')).order_by('-created_at', '-id').values('pk')[:1]
+    return choices_qs.filter(pk=Subquery(latest))
+
+
+def _paginate_results(request, results):
+    limit = request.GET.get('limit', '')
+    per_page = int(limit) if limit.isdigit() and int(limit) > 0 else RESULTS_PER_PAGE
+    return Paginator(results, per_page).get_page(request.GET.get('page'))
 
 
 def _get_distinct_ips(step):
@@ -68,19 +88,20 @@ class OptionAdmin(admin.ModelAdmin):
 
     def step1_popularity_view(self, request):
         ip_filter = request.GET.get('ip')
-        choices_qs = Choice.objects.filter(step=1)
+        selection_filter = models.Q(selected_choices__step=1)
         if ip_filter:
-            choices_qs = choices_qs.filter(ip_address=ip_filter)
-        selected_ids = choices_qs.values_list('selected_id', flat=True)
+            selection_filter &= models.Q(selected_choices__ip_address=ip_filter)
         options = (
-            Option.objects.filter(id__in=selected_ids)
-            .annotate(count=Count('selected_choices', filter=models.Q(selected_choices__step=1)))
-            .order_by('-count')
+            Option.objects.annotate(count=Count('selected_choices', filter=selection_filter))
+            .filter(count__gt=0)
+            .order_by('-count', 'id')
         )
+        page = _paginate_results(request, options)
         context = {
             **self.admin_site.each_context(request),
             'title': 'Step 1 - Popularity',
-            'options': options,
+            'options': page,
+            'page_obj': page,
             'ips': _get_distinct_ips(1),
             'selected_ip': ip_filter,
         }
@@ -88,25 +109,27 @@ class OptionAdmin(admin.ModelAdmin):
 
     def step2_streak_view(self, request):
         ip_filter = request.GET.get('ip')
-        choices_qs = Choice.objects.filter(step=2).order_by('session_id', 'created_at')
+        choices_qs = Choice.objects.filter(step=2).order_by('session_id', 'created_at', 'id')
         if ip_filter:
             choices_qs = choices_qs.filter(ip_address=ip_filter)
         streak_data = {}
-        for session_id in choices_qs.values_list('session_id', flat=True).distinct():
-            session_choices = choices_qs.filter(session_id=session_id).order_by('created_at')
-            longest_option, longest_streak = _calculate_session_streak(session_choices)
-            if longest_option:
-                key = longest_option.id
-                if key not in streak_data:
-                    streak_data[key] = {'option': longest_option, 'max_streak': 0, 'sessions': 0}
-                if longest_streak > streak_data[key]['max_streak']:
-                    streak_data[key]['max_streak'] = longest_streak
-                streak_data[key]['sessions'] += 1
-        results = sorted(streak_data.values(), key=lambda x: -x['max_streak'])
+        rows = choices_qs.values_list('session_id', 'selected_id').iterator(chunk_size=CHOICES_CHUNK_SIZE)
+        for longest_option_id, longest_streak in _iter_session_streaks(rows):
+            if longest_option_id:
+                if longest_option_id not in streak_data:
+                    streak_data[longest_option_id] = {'max_streak': 0, 'sessions': 0}
+                if longest_streak > streak_data[longest_option_id]['max_streak']:
+                    streak_data[longest_option_id]['max_streak'] = longest_streak
+                streak_data[longest_option_id]['sessions'] += 1
+        ranked = sorted(streak_data.items(), key=lambda item: -item[1]['max_streak'])
+        page = _paginate_results(request, ranked)
+        options = Option.objects.in_bulk([option_id for option_id, _ in page])
+        results = [{'option': options[option_id], **stats} for option_id, stats in page]
         context = {
             **self.admin_site.each_context(request),
             'title': 'Step 2 - Longest Streak',
             'results': results,
+            'page_obj': page,
             'ips': _get_distinct_ips(2),
             'selected_ip': ip_filter,
         }
@@ -117,19 +140,18 @@ class OptionAdmin(admin.ModelAdmin):
         choices_qs = Choice.objects.filter(step=2)
         if ip_filter:
             choices_qs = choices_qs.filter(ip_address=ip_filter)
-        final_counts = {}
-        for session_id in choices_qs.values_list('session_id', flat=True).distinct():
-            last_choice = choices_qs.filter(session_id=session_id).order_by('-created_at').first()
-            if last_choice:
-                opt = last_choice.selected
-                if opt.id not in final_counts:
-                    final_counts[opt.id] = {'option': opt, 'count': 0}
-                final_counts[opt.id]['count'] += 1
-        results = sorted(final_counts.values(), key=lambda x: -x['count'])
+        last_choices = _get_last_choice_per_session(choices_qs)
+        final_counts = Counter(
+            last_choices.values_list('selected_id', flat=True).iterator(chunk_size=CHOICES_CHUNK_SIZE)
+        )
+        page = _paginate_results(request, final_counts.most_common())
+        options = Option.objects.in_bulk([option_id for option_id, _ in page])
+        results = [{'option': options[option_id], 'count': count} for option_id, count in page]
         context = {
             **self.admin_site.each_context(request),
             'title': 'Step 2 - Final Winners',
             'results': results,
+            'page_obj': page,
             'ips': _get_distinct_ips(2),
             'selected_ip': ip_filter,
         }
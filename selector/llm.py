@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from contextlib import closing
 from openai import OpenAI
 
 
@@ -32,16 +33,28 @@ Always respond with exactly 2 options, one per line, without numbering or prefix
             rejected_text = f"\n\nDeprioritize these options (user rejected both): {', '.join(rejected)}"
         user_content = f"{prompt}{history_text}{rejected_text}\n\nGenerate exactly 2 options, one per line."
         try:
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": self.SYSTEM_PROMPT},
                     {"role": "user", "content": user_content}
-                ]
+                ],
+                stream=True
             )
+            content = self._read_two_lines(stream)
         except Exception as e:
             raise LLMError(f"API call failed: {e}") from e
-        lines = response.choices[0].message.content.strip().split('\n')
-        opt_a = lines[0].strip()
-        opt_b = lines[1].strip() if len(lines) > 1 else ""
-        return opt_a, opt_b
+        first, _, rest = content.strip().partition('\n')
+        second = rest.partition('\n')[0]
+        return first.strip(), second.strip()
+
+    def _read_two_lines(self, stream) -> str:
+        content = ""
+        with closing(stream):
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content += chunk.choices[0].delta.content or ""
+                if content.lstrip().count('\n') >= 2:
+                    break
+        return content
@@ -29,6 +29,22 @@ class UnduplicateCommandTest(TestCase):
             self.assertFalse(Option.objects.filter(id=opt2.id).exists())
             self.assertFalse(Option.objects.filter(id=opt3.id).exists())
 
+    def test_merges_tab_and_non_ascii_case_variants(self):
+        cafe = Option.objects.create(text='café')
+        Option.objects.create(text='CAFÉ')
+        tabbed = Option.objects.create(text='option\t')
+        Option.objects.create(text='option')
+        call_command('unduplicate_options', stdout=StringIO())
+        texts = dict(Option.objects.values_list('id', 'text'))
+        self.assertEqual(texts, {cafe.id: 'CAFÉ', tabbed.id: 'OPTION'})
+
+    def test_breaks_created_at_ties_by_id(self):
+        opt1 = Option.objects.create(text='option')
+        opt2 = Option.objects.create(text='OPTION')
+        Option.objects.filter(id=opt2.id).update(created_at=opt1.created_at)
+        call_command('unduplicate_options', stdout=StringIO())
+        self.assertEqual(list(Option.objects.values_list('id', flat=True)), [opt1.id])
+
     def test_updates_selected_choice_references(self):
         opt1 = Option.objects.create(text='option')
         opt2 = Option.objects.create(text='OPTION')
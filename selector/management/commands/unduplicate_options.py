@@ -1,5 +1,8 @@
-from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
 from selector.models import Option, Choice
 
 
@@ -15,21 +18,26 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         dry_run = options.get('dry_run', False)
-        options_by_normalized = defaultdict(list)
-        for option in Option.objects.all().order_by('created_at'):
-            normalized = option.text.strip().upper()
-            options_by_normalized[normalized].append(option)
-        for normalized, option_list in options_by_normalized.items():
-            preferred = option_list[0]
-            duplicates = option_list[1:]
-            for duplicate in duplicates:
-                action = 'Would merge' if dry_run else 'Merging'
-                self.stdout.write(f'{action} option {duplicate.id} into {preferred.id}')
+        duplicated_texts = (
+            Option.objects.values('normalized_text')
+            .annotate(options_count=Count('id'))
+            .filter(options_count__gt=1)
+            .values('normalized_text')
+        )
+        duplicate_rows = (
+            Option.objects.filter(normalized_text__in=duplicated_texts)
+            .order_by('normalized_text', 'created_at', 'id')
+            .values_list('normalized_text', 'id')
+        )
+        with transaction.atomic():
+            for _, group in groupby(duplicate_rows, key=itemgetter(0)):
+                preferred_id, *duplicate_ids = [option_id for _, option_id in group]
+                for duplicate_id in duplicate_ids:
+                    action = 'Would merge' if dry_run else 'Merging'
+                    self.stdout.write(f'{action} option {duplicate_id} into {preferred_id}')
                 if not dry_run:
-                    Choice.objects.filter(selected=duplicate).update(selected=preferred)
-                    Choice.objects.filter(rejected=duplicate).update(rejected=preferred)
+                    Choice.objects.filter(selected_id__in=duplicate_ids).update(selected_id=preferred_id)
+                    Choice.objects.filter(rejected_id__in=duplicate_ids).update(rejected_id=preferred_id)
+                    Option.objects.filter(id__in=duplicate_ids).delete()
             if not dry_run:
-                preferred.text = normalized
-                preferred.save()
-                for duplicate in duplicates:
-                    duplicate.delete()
+                Option.objects.exclude(text=F('normalized_text')).update(text=F('normalized_text'))
@@ -0,0 +1,12 @@
+from django.utils.functional import SimpleLazyObject
+
+from selector.models import AdminConfig
+
+
+class AdminConfigMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.admin_config = SimpleLazyObject(AdminConfig.get_cached)
+        return self.get_response(request)
@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-14 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('selector', '0002_alter_choice_selected'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='choice',
+            index=models.Index(fields=['step', 'session_id', 'created_at'], name='choice_step_session_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choice',
+            index=models.Index(fields=['step', 'selected'], name='choice_step_selected_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choice',
+            index=models.Index(fields=['ip_address'], name='choice_ip_address_idx'),
+        ),
+    ]
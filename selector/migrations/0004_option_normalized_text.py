@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-14 05:06
+
+from django.db import migrations, models
+
+from selector.models import Option as CurrentOption
+
+
+def backfill_normalized_text(apps, schema_editor):
+    Option = apps.get_model('selector', 'Option')
+    options = list(Option.objects.only('id', 'text'))
+    for option in options:
+        option.normalized_text = CurrentOption.normalize_text(option.text)
+    Option.objects.bulk_update(options, ['normalized_text'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('selector', '0003_add_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='option',
+            name='normalized_text',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_normalized_text, migrations.RunPython.noop),
+    ]
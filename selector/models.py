@@ -1,4 +1,8 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 
 class AdminConfig(models.Model):
@@ -15,6 +19,17 @@ class AdminConfig(models.Model):
     current_step = models.IntegerField(choices=STEP_CHOICES, default=STEP_DISABLED)
     rounds_count = models.IntegerField(default=5)
 
+    CACHE_KEY = 'admin_config'
+
+    @classmethod
+    def get_cached(cls):
+        return cache.get_or_set(cls.CACHE_KEY, cls.objects.first, settings.ADMIN_CONFIG_CACHE_TIMEOUT)
+
+
+@receiver([post_save, post_delete], sender=AdminConfig)
+def _invalidate_admin_config_cache(sender, **kwargs):
+    cache.delete(AdminConfig.CACHE_KEY)
+
 
 class Option(models.Model):
     SOURCE_CHOICES = [
@@ -22,10 +37,26 @@ class Option(models.Model):
         ('user_submitted', 'User Submitted'),
     ]
     text = models.CharField(max_length=255)
+    normalized_text = models.CharField(max_length=255, db_index=True, editable=False)
     source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='llm_generated')
     created_at = models.DateTimeField(auto_now_add=True)
     session_id = models.CharField(max_length=64, blank=True, default='')
 
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return text.strip().upper()
+
+    @classmethod
+    def get_by_normalized_text(cls, normalized_text: str) -> 'Option | None':
+        return cls.objects.filter(normalized_text=normalized_text).order_by('created_at', 'id').first()
+
+    def save(self, *args, **kwargs):
+        self.normalized_text = self.normalize_text(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'normalized_text'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f'[{self.id}]: {self.text}'
 
@@ -49,6 +80,13 @@ class Choice(models.Model):
     ip_address = models.GenericIPAddressField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['step', 'session_id', 'created_at'], name='choice_step_session_idx'),
+            models.Index(fields=['step', 'selected'], name='choice_step_selected_idx'),
+            models.Index(fields=['ip_address'], name='choice_ip_address_idx'),
+        ]
+
 
 class UserSession(models.Model):
     session_key = models.CharField(max_length=64, unique=True)
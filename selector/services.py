@@ -1,32 +1,63 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Exists, F, OuterRef, Q, Subquery, Value, When
+
 from selector.models import AdminConfig, Option, Choice, UserSession
 from selector.llm import LLMAdapter
 
 
+def _advance_session_round(session_key: str, total_rounds: int, step: int):
+    completes_step = Q(current_round__gte=total_rounds - 1)
+    session_rows = UserSession.objects.filter(session_key=session_key)
+    advance = {
+        'current_round': F('current_round') + 1,
+        'is_completed': Case(When(completes_step, then=Value(True)), default=F('is_completed')),
+        'step_completed': Case(When(completes_step, then=Value(step)), default=F('step_completed')),
+    }
+    if session_rows.update(**advance):
+        return
+    is_completed = total_rounds <= 1
+    try:
+        with transaction.atomic():
+            UserSession.objects.create(
+                session_key=session_key,
+                current_round=1,
+                is_completed=is_completed,
+                step_completed=step if is_completed else 0
+            )
+    except IntegrityError:
+        session_rows.update(**advance)
+
+
 class Step1Service:
-    def __init__(self, llm_adapter: LLMAdapter):
+    def __init__(self, llm_adapter: LLMAdapter, config: AdminConfig | None = None):
         self.llm_adapter = llm_adapter
+        self._config = config
+
+    def _get_config(self) -> AdminConfig:
+        if self._config is None:
+            self._config = AdminConfig.get_cached()
+        return self._config
 
     def _get_or_create_option(self, text: str, source: str = 'llm_generated', session_id: str = '') -> Option:
-        normalized = text.strip().upper()
-        option, _ = Option.objects.get_or_create(
-            text=normalized,
-            defaults={'source': source, 'session_id': session_id}
-        )
+        normalized = Option.normalize_text(text)
+        option = Option.get_by_normalized_text(normalized)
+        if option is None:
+            option = Option.objects.create(text=normalized, source=source, session_id=session_id)
         return option
 
     def get_current_pair(self, session_key: str) -> tuple[Option, Option] | None:
-        config = AdminConfig.objects.first()
+        config = self._get_config()
         session, _ = UserSession.objects.get_or_create(session_key=session_key)
         if session.current_round >= config.rounds_count:
             return None
-        history = list(
-            Choice.objects.filter(session_id=session_key, step=1, selected__isnull=False)
-            .values_list('selected__text', flat=True)
-        )
-        rejected = list(
-            Choice.objects.filter(session_id=session_key, step=1, selected__isnull=True)
-            .values_list('rejected__text', flat=True)
-        )
+        history = []
+        rejected = []
+        step1_choices = Choice.objects.filter(session_id=session_key, step=1).values_list('selected__text', 'rejected__text')
+        for selected_text, rejected_text in step1_choices:
+            if selected_text is not None:
+                history.append(selected_text)
+            elif rejected_text is not None:
+                rejected.append(rejected_text)
         opt_a_text, opt_b_text = self.llm_adapter.generate_options(
             prompt=config.prompt,
             history=history,
@@ -37,8 +68,7 @@ class Step1Service:
         return opt_a, opt_b
 
     def record_selection(self, session_key: str, selected_id: int, rejected_id: int, ip_address: str):
-        config = AdminConfig.objects.first()
-        session, _ = UserSession.objects.get_or_create(session_key=session_key)
+        config = self._get_config()
         Choice.objects.create(
             selected_id=selected_id,
             rejected_id=rejected_id,
@@ -46,11 +76,7 @@ class Step1Service:
             session_id=session_key,
             ip_address=ip_address
         )
-        session.current_round += 1
-        if session.current_round >= config.rounds_count:
-            session.is_completed = True
-            session.step_completed = 1
-        session.save()
+        _advance_session_round(session_key, config.rounds_count, step=1)
 
     def submit_manual_option(self, session_key: str, text: str) -> Option:
         option = self._get_or_create_option(text, source='user_submitted', session_id=session_key)
@@ -63,33 +89,39 @@ class Step1Service:
         return option
 
     def record_neither(self, session_key: str, option_a_id: int, option_b_id: int, ip_address: str):
-        config = AdminConfig.objects.first()
-        session, _ = UserSession.objects.get_or_create(session_key=session_key)
-        Choice.objects.create(
-            selected=None,
-            rejected_id=option_a_id,
-            step=1,
-            session_id=session_key,
-            ip_address=ip_address
-        )
-        Choice.objects.create(
-            selected=None,
-            rejected_id=option_b_id,
-            step=1,
-            session_id=session_key,
-            ip_address=ip_address
-        )
-        session.current_round += 1
-        if session.current_round >= config.rounds_count:
-            session.is_completed = True
-            session.step_completed = 1
-        session.save()
+        config = self._get_config()
+        Choice.objects.bulk_create([
+            Choice(selected=None, rejected_id=rejected_id, step=1, session_id=session_key, ip_address=ip_address)
+            for rejected_id in (option_a_id, option_b_id)
+        ])
+        _advance_session_round(session_key, config.rounds_count, step=1)
 
 
 class Step2Service:
+    def __init__(self):
+        self._eligible_options = None
+
+    def _eligible_options_queryset(self):
+        step1_selections = Choice.objects.filter(step=1, selected=OuterRef('pk'))
+        return Option.objects.filter(Exists(step1_selections)).order_by('id')
+
     def get_eligible_options(self) -> list[Option]:
-        selected_ids = Choice.objects.filter(step=1).values_list('selected_id', flat=True).distinct()
-        return list(Option.objects.filter(id__in=selected_ids).order_by('id'))
+        if self._eligible_options is None:
+            self._eligible_options = list(self._eligible_options_queryset())
+        return self._eligible_options
+
+    def _get_eligible_options_with_last_choice(self, session_key: str) -> tuple[list[Option], int | None, int | None]:
+        last_choice = Choice.objects.filter(session_id=session_key, step=2).order_by('-created_at', '-id')
+        self._eligible_options = list(
+            self._eligible_options_queryset().annotate(
+                last_selected_id=Subquery(last_choice.values('selected_id')[:1]),
+                last_selected_position=Subquery(last_choice.values('selected_position')[:1])
+            )
+        )
+        if not self._eligible_options:
+            return self._eligible_options, None, None
+        first = self._eligible_options[0]
+        return self._eligible_options, first.last_selected_id, first.last_selected_position
 
     def get_total_rounds(self) -> int:
         options = self.get_eligible_options()
@@ -101,7 +133,7 @@ class Step2Service:
     def _get_last_step2_choice(self, session_key: str) -> Choice | None:
         return Choice.objects.filter(
             session_id=session_key, step=2
-        ).order_by('-created_at').first()
+        ).select_related('selected').only('selected').order_by('-created_at', '-id').first()
 
     def _get_next_challenger(self, options: list[Option], round_number: int) -> Option | None:
         challenger_index = round_number + 1
@@ -109,30 +141,35 @@ class Step2Service:
             return None
         return options[challenger_index]
 
-    def _order_pair_by_winner_position(self, winner: Option, challenger: Option, last_choice: Choice) -> tuple[Option, Option]:
-        if last_choice.selected_position == Choice.POSITION_RIGHT:
+    def _order_pair_by_winner_position(self, winner: Option, challenger: Option, winner_position: int | None) -> tuple[Option, Option]:
+        if winner_position == Choice.POSITION_RIGHT:
             return challenger, winner
         return winner, challenger
 
+    def _find_winner(self, options: list[Option], winner_id: int) -> Option:
+        for option in options:
+            if option.id == winner_id:
+                return option
+        return Option.objects.get(pk=winner_id)
+
     def get_current_pair(self, session_key: str) -> tuple[Option, Option] | None:
         session, _ = UserSession.objects.get_or_create(session_key=session_key)
-        options = self.get_eligible_options()
+        options, winner_id, winner_position = self._get_eligible_options_with_last_choice(session_key)
         if len(options) < 2:
             return None
         if session.current_round >= len(options) - 1:
             return None
         if session.current_round == 0:
             return self._get_initial_pair(options)
-        last_choice = self._get_last_step2_choice(session_key)
-        if not last_choice:
+        if winner_id is None:
             return self._get_initial_pair(options)
         challenger = self._get_next_challenger(options, session.current_round)
         if not challenger:
             return None
-        return self._order_pair_by_winner_position(last_choice.selected, challenger, last_choice)
+        winner = self._find_winner(options, winner_id)
+        return self._order_pair_by_winner_position(winner, challenger, winner_position)
 
     def record_selection(self, session_key: str, selected_id: int, rejected_id: int, ip_address: str, selected_position: int = None):
-        session, _ = UserSession.objects.get_or_create(session_key=session_key)
         Choice.objects.create(
             selected_id=selected_id,
             rejected_id=rejected_id,
@@ -141,12 +178,7 @@ class Step2Service:
             session_id=session_key,
             ip_address=ip_address
         )
-        session.current_round += 1
-        total_rounds = self.get_total_rounds()
-        if session.current_round >= total_rounds:
-            session.is_completed = True
-            session.step_completed = 2
-        session.save()
+        _advance_session_round(session_key, self.get_total_rounds(), step=2)
 
     def _calculate_streak(self, choices) -> tuple[Option | None, int]:
         current_streak = 0
@@ -165,7 +197,7 @@ class Step2Service:
         return longest_streak_option, longest_streak
 
     def get_streak_stats(self, session_key: str) -> dict:
-        choices = Choice.objects.filter(session_id=session_key, step=2).order_by('created_at')
+        choices = Choice.objects.filter(session_id=session_key, step=2).select_related('selected').only('selected').order_by('created_at', 'id')
         longest_streak_option, longest_streak = self._calculate_streak(choices)
         return {
             'longest_streak_option': longest_streak_option,
@@ -1,13 +1,35 @@
 from abc import ABC
 import inspect
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
 from django.utils import timezone
 
 from selector.models import AdminConfig, Option, Choice, UserSession
 from selector.services import Step1Service, Step2Service
 from selector.llm import LLMAdapter, OpenAIAdapter, LLMError
+from selector.middleware import AdminConfigMiddleware
+from selector.views import get_llm_adapter
+
+SESS1 = "sess1"
+IP1 = "192.168.1.1"
+PROMPT_DEFAULT = "Domain: mascot names. Criteria: playful, memorable"
+_FAKE_ADAPTER = SimpleNamespace(generate_options=lambda *args, **kwargs: ("Alex", "Pablo"))
+
+
+def _openai_stream(content):
+    chunks = [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+        for piece in content.splitlines(keepends=True)
+    ]
+    stream = MagicMock()
+    stream.__iter__.return_value = iter(chunks)
+    return stream
 
 
 class AdminConfigModelTest(TestCase):
@@ -34,6 +56,17 @@ class AdminConfigModelTest(TestCase):
         with self.assertRaises(Exception):
             AdminConfig.objects.create(prompt="second")
 
+    def test_get_cached_reuses_config_until_saved(self):
+        config = AdminConfig.objects.create(prompt="test", current_step=1)
+        AdminConfig.get_cached()
+        with self.subTest(check="cached"):
+            with self.assertNumQueries(0):
+                self.assertEqual(AdminConfig.get_cached().current_step, 1)
+        config.current_step = 2
+        config.save()
+        with self.subTest(check="invalidated"):
+            self.assertEqual(AdminConfig.get_cached().current_step, 2)
+
 
 class OptionModelTest(TestCase):
     def test_stores_text_value(self):
@@ -54,10 +87,8 @@ class OptionModelTest(TestCase):
         before = timezone.now()
         option = Option.objects.create(text="Alex")
         after = timezone.now()
-        with self.subTest(check="lower_bound"):
-            self.assertGreaterEqual(option.created_at, before)
-        with self.subTest(check="upper_bound"):
-            self.assertLessEqual(option.created_at, after)
+        self.assertGreaterEqual(option.created_at, before)
+        self.assertLessEqual(option.created_at, after)
 
     def test_stores_session_id(self):
         option = Option.objects.create(text="Alex", session_id="abc123")
@@ -65,18 +96,21 @@ class OptionModelTest(TestCase):
 
 
 class ChoiceModelTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.opt_alex = Option.objects.create(text="Alex")
+        cls.opt_pablo = Option.objects.create(text="Pablo")
+
     def test_stores_selected_and_rejected_options(self):
-        opt_a = Option.objects.create(text="Alex")
-        opt_b = Option.objects.create(text="Pablo")
+        opt_a = self.opt_alex
+        opt_b = self.opt_pablo
         choice = Choice.objects.create(selected=opt_a, rejected=opt_b)
-        with self.subTest(field="selected"):
-            self.assertEqual(choice.selected, opt_a)
-        with self.subTest(field="rejected"):
-            self.assertEqual(choice.rejected, opt_b)
+        self.assertEqual(choice.selected, opt_a)
+        self.assertEqual(choice.rejected, opt_b)
 
     def test_stores_step(self):
-        opt_a = Option.objects.create(text="Alex")
-        opt_b = Option.objects.create(text="Pablo")
+        opt_a = self.opt_alex
+        opt_b = self.opt_pablo
         steps = [(1, 1), (2, 2)]
         for step, expected in steps:
             with self.subTest(step=step):
@@ -84,27 +118,23 @@ class ChoiceModelTest(TestCase):
                 self.assertEqual(choice.step, expected)
 
     def test_stores_session_id_and_ip(self):
-        opt_a = Option.objects.create(text="Alex")
-        opt_b = Option.objects.create(text="Pablo")
+        opt_a = self.opt_alex
+        opt_b = self.opt_pablo
         choice = Choice.objects.create(
             selected=opt_a, rejected=opt_b,
-            session_id="abc123", ip_address="192.168.1.1"
+            session_id="abc123", ip_address=IP1
         )
-        with self.subTest(field="session_id"):
-            self.assertEqual(choice.session_id, "abc123")
-        with self.subTest(field="ip_address"):
-            self.assertEqual(choice.ip_address, "192.168.1.1")
+        self.assertEqual(choice.session_id, "abc123")
+        self.assertEqual(choice.ip_address, IP1)
 
     def test_stores_created_at(self):
-        opt_a = Option.objects.create(text="Alex")
-        opt_b = Option.objects.create(text="Pablo")
+        opt_a = self.opt_alex
+        opt_b = self.opt_pablo
         before = timezone.now()
         choice = Choice.objects.create(selected=opt_a, rejected=opt_b)
         after = timezone.now()
-        with self.subTest(check="lower_bound"):
-            self.assertGreaterEqual(choice.created_at, before)
-        with self.subTest(check="upper_bound"):
-            self.assertLessEqual(choice.created_at, after)
+        self.assertGreaterEqual(choice.created_at, before)
+        self.assertLessEqual(choice.created_at, after)
 
 
 class UserSessionModelTest(TestCase):
@@ -125,133 +155,150 @@ class UserSessionModelTest(TestCase):
         self.assertEqual(session.step_completed, 1)
 
 
-class LLMAdapterInterfaceTest(TestCase):
+class LLMAdapterInterfaceTest(SimpleTestCase):
     def test_base_class_defines_generate_options_method(self):
-        with self.subTest(check="is_abc"):
-            self.assertTrue(issubclass(LLMAdapter, ABC))
-        with self.subTest(check="has_method"):
-            self.assertTrue(hasattr(LLMAdapter, 'generate_options'))
+        self.assertTrue(issubclass(LLMAdapter, ABC))
+        self.assertTrue(hasattr(LLMAdapter, 'generate_options'))
 
     def test_generate_options_signature(self):
-        sig = inspect.signature(LLMAdapter.generate_options)
-        params = list(sig.parameters.keys())
-        required_params = ['self', 'prompt', 'history']
-        for param in required_params:
-            with self.subTest(param=param):
-                self.assertIn(param, params)
+        self.assertEqual(
+            str(inspect.signature(LLMAdapter.generate_options)),
+            "(self, prompt: str, history: list, rejected: list = None) -> tuple[str, str]"
+        )
 
 
-class OpenAIAdapterTest(TestCase):
+class OpenAIAdapterTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.adapter = OpenAIAdapter(api_key="test-key")
+        cls.mock_client = cls.enterClassContext(patch.object(cls.adapter, 'client'))
+
+    def setUp(self):
+        self.mock_client.reset_mock(return_value=True, side_effect=True)
+
     def test_implements_interface(self):
         self.assertTrue(issubclass(OpenAIAdapter, LLMAdapter))
 
     def test_constructs_prompt_with_domain_and_criteria(self):
-        adapter = OpenAIAdapter(api_key="test-key")
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Option1\nOption2"))]
-        with patch.object(adapter, 'client') as mock_client:
-            mock_client.chat.completions.create.return_value = mock_response
-            adapter.generate_options(
-                prompt="Domain: mascot names. Criteria: playful, memorable",
-                history=[]
-            )
-            call_args = mock_client.chat.completions.create.call_args
-            messages = call_args.kwargs['messages']
-            user_message = next(m for m in messages if m['role'] == 'user')
-            with self.subTest(check="domain"):
-                self.assertIn('mascot names', user_message['content'])
-            with self.subTest(check="criteria"):
-                self.assertIn('playful', user_message['content'])
+        mock_stream = _openai_stream("Option1\nOption2")
+        self.mock_client.chat.completions.create.return_value = mock_stream
+        self.adapter.generate_options(
+            prompt=PROMPT_DEFAULT,
+            history=[]
+        )
+        call_args = self.mock_client.chat.completions.create.call_args
+        messages = call_args.kwargs['messages']
+        user_message = messages[-1]
+        with self.subTest(check="roles"):
+            self.assertEqual([m['role'] for m in messages], ['system', 'user'])
+        with self.subTest(check="domain"):
+            self.assertIn('mascot names', user_message['content'])
+        with self.subTest(check="criteria"):
+            self.assertIn('playful', user_message['content'])
 
     def test_includes_history_in_prompt(self):
-        adapter = OpenAIAdapter(api_key="test-key")
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Option1\nOption2"))]
-        with patch.object(adapter, 'client') as mock_client:
-            mock_client.chat.completions.create.return_value = mock_response
-            adapter.generate_options(
-                prompt="Generate names",
-                history=["Alex", "Pablo"]
-            )
-            call_args = mock_client.chat.completions.create.call_args
-            messages = call_args.kwargs['messages']
-            user_message = next(m for m in messages if m['role'] == 'user')
-            history_items = ["Alex", "Pablo"]
-            for item in history_items:
-                with self.subTest(history_item=item):
-                    self.assertIn(item, user_message['content'])
+        mock_stream = _openai_stream("Option1\nOption2")
+        self.mock_client.chat.completions.create.return_value = mock_stream
+        self.adapter.generate_options(
+            prompt="Generate names",
+            history=["Alex", "Pablo"]
+        )
+        call_args = self.mock_client.chat.completions.create.call_args
+        messages = call_args.kwargs['messages']
+        user_message = messages[-1]
+        history_items = ["Alex", "Pablo"]
+        for item in history_items:
+            with self.subTest(history_item=item):
+                self.assertIn(item, user_message['content'])
 
     def test_parses_response_into_two_options(self):
-        adapter = OpenAIAdapter(api_key="test-key")
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Alex\nPablo"))]
-        with patch.object(adapter, 'client') as mock_client:
-            mock_client.chat.completions.create.return_value = mock_response
-            opt_a, opt_b = adapter.generate_options(prompt="test", history=[])
-            with self.subTest(option="a"):
-                self.assertEqual(opt_a, "Alex")
-            with self.subTest(option="b"):
-                self.assertEqual(opt_b, "Pablo")
+        mock_stream = _openai_stream("Alex\nPablo")
+        self.mock_client.chat.completions.create.return_value = mock_stream
+        opt_a, opt_b = self.adapter.generate_options(prompt="test", history=[])
+        self.assertEqual(opt_a, "Alex")
+        self.assertEqual(opt_b, "Pablo")
+
+    def test_parses_only_first_two_lines_of_response(self):
+        mock_stream = _openai_stream("\n Alex \n Pablo \nMaria\n")
+        self.mock_client.chat.completions.create.return_value = mock_stream
+        options = self.adapter.generate_options(prompt="test", history=[])
+        self.assertEqual(options, ("Alex", "Pablo"))
+
+    def test_requests_streamed_completion_and_closes_it(self):
+        mock_stream = _openai_stream("Alex\nPablo\nMaria\n")
+        self.mock_client.chat.completions.create.return_value = mock_stream
+        self.adapter.generate_options(prompt="test", history=[])
+        call_args = self.mock_client.chat.completions.create.call_args
+        with self.subTest(check="stream"):
+            self.assertTrue(call_args.kwargs['stream'])
+        with self.subTest(check="closed"):
+            mock_stream.close.assert_called_once()
 
     def test_handles_api_error(self):
-        adapter = OpenAIAdapter(api_key="test-key")
-        with patch.object(adapter, 'client') as mock_client:
-            mock_client.chat.completions.create.side_effect = Exception("API Error")
-            with self.assertRaises(LLMError):
-                adapter.generate_options(prompt="test", history=[])
+        self.mock_client.chat.completions.create.side_effect = Exception("API Error")
+        with self.assertRaises(LLMError):
+            self.adapter.generate_options(prompt="test", history=[])
+
 
+class PromptConstructionTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.adapter = OpenAIAdapter(api_key="test-key")
+        cls.mock_client = cls.enterClassContext(patch.object(cls.adapter, 'client'))
+
+    def setUp(self):
+        self.mock_client.reset_mock(return_value=True, side_effect=True)
 
-class PromptConstructionTest(TestCase):
     def test_includes_rejected_options_with_deprioritize_instruction(self):
-        adapter = OpenAIAdapter(api_key="test-key")
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Opt1\nOpt2"))]
-        with patch.object(adapter, 'client') as mock_client:
-            mock_client.chat.completions.create.return_value = mock_response
-            adapter.generate_options(
-                prompt="Generate names",
-                history=["Alex"],
-                rejected=["BadOption1", "BadOption2"]
-            )
-            call_args = mock_client.chat.completions.create.call_args
-            messages = call_args.kwargs['messages']
-            user_message = next(m for m in messages if m['role'] == 'user')
-            with self.subTest(check="deprioritize_keyword"):
-                self.assertIn("deprioritize", user_message['content'].lower())
-            with self.subTest(check="rejected_option_1"):
-                self.assertIn("BadOption1", user_message['content'])
-            with self.subTest(check="rejected_option_2"):
-                self.assertIn("BadOption2", user_message['content'])
+        mock_stream = _openai_stream("Opt1\nOpt2")
+        self.mock_client.chat.completions.create.return_value = mock_stream
+        self.adapter.generate_options(
+            prompt="Generate names",
+            history=["Alex"],
+            rejected=["BadOption1", "BadOption2"]
+        )
+        call_args = self.mock_client.chat.completions.create.call_args
+        messages = call_args.kwargs['messages']
+        user_message = messages[-1]
+        with self.subTest(check="deprioritize_keyword"):
+            self.assertIn("deprioritize", user_message['content'].lower())
+        with self.subTest(check="rejected_option_1"):
+            self.assertIn("BadOption1", user_message['content'])
+        with self.subTest(check="rejected_option_2"):
+            self.assertIn("BadOption2", user_message['content'])
 
     def test_system_prompt_instructs_exploitation_exploration(self):
-        adapter = OpenAIAdapter(api_key="test-key")
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Opt1\nOpt2"))]
-        with patch.object(adapter, 'client') as mock_client:
-            mock_client.chat.completions.create.return_value = mock_response
-            adapter.generate_options(prompt="test", history=["Alex"])
-            call_args = mock_client.chat.completions.create.call_args
-            messages = call_args.kwargs['messages']
-            system_msg = next(m for m in messages if m['role'] == 'system')
-            keywords = ['exploit', 'explor']
-            for keyword in keywords:
-                with self.subTest(keyword=keyword):
-                    self.assertIn(keyword, system_msg['content'].lower())
+        mock_stream = _openai_stream("Opt1\nOpt2")
+        self.mock_client.chat.completions.create.return_value = mock_stream
+        self.adapter.generate_options(prompt="test", history=["Alex"])
+        call_args = self.mock_client.chat.completions.create.call_args
+        messages = call_args.kwargs['messages']
+        system_msg = messages[0]
+        keywords = ['exploit', 'explor']
+        for keyword in keywords:
+            with self.subTest(keyword=keyword):
+                self.assertIn(keyword, system_msg['content'].lower())
 
 
 class Step1ServiceTest(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         AdminConfig.objects.create(
-            prompt="Domain: mascot names. Criteria: playful, memorable",
+            prompt=PROMPT_DEFAULT,
             current_step=1,
             rounds_count=5
         )
 
+    def setUp(self):
+        cache.clear()
+        self.mock_adapter = MagicMock()
+        self.service = Step1Service(llm_adapter=self.mock_adapter)
+
     def test_llm_generated_option_normalizes_text(self):
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ('  alex  ', '  pablo  ')
-        service = Step1Service(llm_adapter=mock_adapter)
-        opt_a, opt_b = service.get_current_pair(session_key='sess1')
+        self.mock_adapter.generate_options.return_value = ('  alex  ', '  pablo  ')
+        opt_a, opt_b = self.service.get_current_pair(session_key=SESS1)
         with self.subTest('should normalize option a'):
             self.assertEqual(opt_a.text, 'ALEX')
         with self.subTest('should normalize option b'):
@@ -259,212 +306,266 @@ class Step1ServiceTest(TestCase):
 
     def test_llm_generated_option_reuses_existing_option(self):
         existing = Option.objects.create(text='ALEX')
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ('  alex  ', 'Pablo')
-        service = Step1Service(llm_adapter=mock_adapter)
-        opt_a, opt_b = service.get_current_pair(session_key='sess1')
+        self.mock_adapter.generate_options.return_value = ('  alex  ', 'Pablo')
+        opt_a, opt_b = self.service.get_current_pair(session_key=SESS1)
         with self.subTest('should reuse existing option'):
             self.assertEqual(opt_a.id, existing.id)
         with self.subTest('should not create duplicate'):
             self.assertEqual(Option.objects.filter(text='ALEX').count(), 1)
 
+    def test_llm_generated_option_reuses_option_by_normalized_text(self):
+        existing = Option.objects.create(text=' Alex ')
+        self.mock_adapter.generate_options.return_value = ('ALEX', 'Pablo')
+        opt_a, opt_b = self.service.get_current_pair(session_key=SESS1)
+        self.assertEqual(opt_a.id, existing.id)
+
+    def test_llm_generated_option_reuses_oldest_of_case_variant_duplicates(self):
+        oldest = Option.objects.create(text='Alex')
+        Option.objects.create(text='ALEX')
+        self.mock_adapter.generate_options.return_value = ('alex', 'Pablo')
+        opt_a, opt_b = self.service.get_current_pair(session_key=SESS1)
+        self.assertEqual(opt_a.id, oldest.id)
+
+    def test_manual_option_reuses_option_differing_by_tab_or_non_ascii_case(self):
+        cafe = Option.objects.create(text='café')
+        tabbed = Option.objects.create(text='option\t')
+        with self.subTest(text='CAFÉ'):
+            self.assertEqual(self.service.submit_manual_option(session_key=SESS1, text='CAFÉ').id, cafe.id)
+        with self.subTest(text='option'):
+            self.assertEqual(self.service.submit_manual_option(session_key=SESS1, text='option').id, tabbed.id)
+
+    def test_reused_option_is_found_with_a_single_lookup(self):
+        existing = Option.objects.create(text='ALEX')
+        with self.assertNumQueries(2):
+            option = self.service.submit_manual_option(session_key=SESS1, text='alex')
+        with self.subTest(field="id"):
+            self.assertEqual(option.id, existing.id)
+        with self.subTest(field="text"):
+            self.assertEqual(option.text, 'ALEX')
+
     def test_manual_option_normalizes_input(self):
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        option = service.submit_manual_option(session_key='sess1', text='  my option  ')
+        option = self.service.submit_manual_option(session_key=SESS1, text='  my option  ')
         self.assertEqual(option.text, 'MY OPTION')
 
     def test_manual_option_reuses_existing_option(self):
         existing = Option.objects.create(text='MY OPTION')
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        option = service.submit_manual_option(session_key='sess1', text='  my option  ')
+        option = self.service.submit_manual_option(session_key=SESS1, text='  my option  ')
         with self.subTest('should reuse existing option'):
             self.assertEqual(option.id, existing.id)
         with self.subTest('should not create duplicate'):
             self.assertEqual(Option.objects.filter(text='MY OPTION').count(), 1)
 
     def test_get_pair_for_new_session(self):
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ("Alex", "Pablo")
-        service = Step1Service(llm_adapter=mock_adapter)
-        opt_a, opt_b = service.get_current_pair(session_key="new-session")
+        self.mock_adapter.generate_options.return_value = ("Alex", "Pablo")
+        with self.assertNumQueries(10):
+            opt_a, opt_b = self.service.get_current_pair(session_key="new-session")
         with self.subTest(option="a"):
             self.assertEqual(opt_a.text, "ALEX")
         with self.subTest(option="b"):
             self.assertEqual(opt_b.text, "PABLO")
 
     def test_get_pair_uses_history_after_selection(self):
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ("Maria", "Hope")
-        service = Step1Service(llm_adapter=mock_adapter)
-        opt_alex = Option.objects.create(text="Alex", session_id="sess1")
-        opt_pablo = Option.objects.create(text="Pablo", session_id="sess1")
-        Choice.objects.create(selected=opt_alex, rejected=opt_pablo, session_id="sess1", step=1)
-        service.get_current_pair(session_key="sess1")
-        call_args = mock_adapter.generate_options.call_args
+        self.mock_adapter.generate_options.return_value = ("Maria", "Hope")
+        opt_alex = Option.objects.create(text="Alex", session_id=SESS1)
+        opt_pablo = Option.objects.create(text="Pablo", session_id=SESS1)
+        Choice.objects.create(selected=opt_alex, rejected=opt_pablo, session_id=SESS1, step=1)
+        self.service.get_current_pair(session_key=SESS1)
+        call_args = self.mock_adapter.generate_options.call_args
         history = call_args.kwargs.get('history') or call_args.args[1]
         self.assertIn("Alex", history)
 
     def test_respects_rounds_count_limit(self):
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        UserSession.objects.create(session_key="sess1", current_round=5)
-        result = service.get_current_pair(session_key="sess1")
+        UserSession.objects.create(session_key=SESS1, current_round=5)
+        result = self.service.get_current_pair(session_key=SESS1)
         self.assertIsNone(result)
 
     def test_record_selection_creates_choice(self):
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        opt_a = Option.objects.create(text="Alex", session_id="sess1")
-        opt_b = Option.objects.create(text="Pablo", session_id="sess1")
-        service.record_selection(
-            session_key="sess1",
+        opt_a = Option.objects.create(text="Alex", session_id=SESS1)
+        opt_b = Option.objects.create(text="Pablo", session_id=SESS1)
+        self.service.record_selection(
+            session_key=SESS1,
             selected_id=opt_a.id,
             rejected_id=opt_b.id,
-            ip_address="192.168.1.1"
+            ip_address=IP1
         )
-        choice = Choice.objects.get(session_id="sess1")
+        choice = Choice.objects.select_related("selected", "rejected").get(session_id=SESS1)
         assertions = [
             ("selected", choice.selected, opt_a),
             ("rejected", choice.rejected, opt_b),
             ("step", choice.step, 1),
-            ("ip_address", choice.ip_address, "192.168.1.1"),
+            ("ip_address", choice.ip_address, IP1),
         ]
         for field, actual, expected in assertions:
             with self.subTest(field=field):
                 self.assertEqual(actual, expected)
 
     def test_record_selection_increments_round(self):
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        opt_a = Option.objects.create(text="Alex", session_id="sess1")
-        opt_b = Option.objects.create(text="Pablo", session_id="sess1")
-        service.record_selection(
-            session_key="sess1",
+        opt_a = Option.objects.create(text="Alex", session_id=SESS1)
+        opt_b = Option.objects.create(text="Pablo", session_id=SESS1)
+        self.service.record_selection(
+            session_key=SESS1,
             selected_id=opt_a.id,
             rejected_id=opt_b.id,
-            ip_address="192.168.1.1"
+            ip_address=IP1
         )
-        session = UserSession.objects.get(session_key="sess1")
+        session = UserSession.objects.get(session_key=SESS1)
         self.assertEqual(session.current_round, 1)
 
+    def test_record_selection_uses_config_passed_in(self):
+        service = Step1Service(llm_adapter=self.mock_adapter, config=AdminConfig.objects.first())
+        UserSession.objects.create(session_key=SESS1, current_round=3)
+        opt_a = Option.objects.create(text="Alex", session_id=SESS1)
+        opt_b = Option.objects.create(text="Pablo", session_id=SESS1)
+        with self.assertNumQueries(2):
+            service.record_selection(SESS1, opt_a.id, opt_b.id, IP1)
+
+    def test_record_selection_advances_session_created_concurrently(self):
+        opt_a = Option.objects.create(text="Alex", session_id=SESS1)
+        opt_b = Option.objects.create(text="Pablo", session_id=SESS1)
+        real_update = QuerySet.update
+        calls = []
+
+        def update_after_concurrent_create(queryset, **kwargs):
+            if queryset.model is UserSession and not calls:
+                calls.append(kwargs)
+                UserSession.objects.create(session_key=SESS1, current_round=1)
+                return 0
+            return real_update(queryset, **kwargs)
+
+        with patch.object(QuerySet, 'update', autospec=True, side_effect=update_after_concurrent_create):
+            self.service.record_selection(SESS1, opt_a.id, opt_b.id, IP1)
+        session = UserSession.objects.get(session_key=SESS1)
+        self.assertEqual(session.current_round, 2)
+
     def test_record_selection_marks_complete_after_all_rounds(self):
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        UserSession.objects.create(session_key="sess1", current_round=4)
-        opt_a = Option.objects.create(text="Alex", session_id="sess1")
-        opt_b = Option.objects.create(text="Pablo", session_id="sess1")
-        service.record_selection(
-            session_key="sess1",
+        UserSession.objects.create(session_key=SESS1, current_round=4)
+        opt_a = Option.objects.create(text="Alex", session_id=SESS1)
+        opt_b = Option.objects.create(text="Pablo", session_id=SESS1)
+        self.service.record_selection(
+            session_key=SESS1,
             selected_id=opt_a.id,
             rejected_id=opt_b.id,
-            ip_address="192.168.1.1"
+            ip_address=IP1
         )
-        session = UserSession.objects.get(session_key="sess1")
+        session = UserSession.objects.only("is_completed", "step_completed").get(session_key=SESS1)
         with self.subTest(field="is_completed"):
             self.assertTrue(session.is_completed)
         with self.subTest(field="step_completed"):
             self.assertEqual(session.step_completed, 1)
 
     def test_submit_manual_option_creates_user_submitted_option(self):
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        option = service.submit_manual_option(session_key="sess1", text="MyCustomName")
+        option = self.service.submit_manual_option(session_key=SESS1, text="MyCustomName")
         assertions = [
             ("text", option.text, "MYCUSTOMNAME"),
             ("source", option.source, "user_submitted"),
-            ("session_id", option.session_id, "sess1"),
+            ("session_id", option.session_id, SESS1),
         ]
         for field, actual, expected in assertions:
             with self.subTest(field=field):
                 self.assertEqual(actual, expected)
 
     def test_submit_manual_option_creates_vote(self):
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        option = service.submit_manual_option(session_key="sess1", text="MyCustomName")
-        choice = Choice.objects.get(session_id="sess1", step=1)
+        option = self.service.submit_manual_option(session_key=SESS1, text="MyCustomName")
+        choice = Choice.objects.select_related("selected").get(session_id=SESS1, step=1)
         self.assertEqual(choice.selected, option)
 
     def test_submit_manual_option_included_in_llm_history(self):
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ("NewOpt1", "NewOpt2")
-        service = Step1Service(llm_adapter=mock_adapter)
-        service.submit_manual_option(session_key="sess1", text="MyCustomName")
-        service.get_current_pair(session_key="sess1")
-        call_args = mock_adapter.generate_options.call_args
+        self.mock_adapter.generate_options.return_value = ("NewOpt1", "NewOpt2")
+        self.service.submit_manual_option(session_key=SESS1, text="MyCustomName")
+        self.service.get_current_pair(session_key=SESS1)
+        call_args = self.mock_adapter.generate_options.call_args
         history = call_args.kwargs.get('history') or call_args.args[1]
         self.assertIn("MYCUSTOMNAME", history)
 
     def test_submit_manual_option_eligible_for_step2(self):
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        option = service.submit_manual_option(session_key="sess1", text="MyCustomName")
+        option = self.service.submit_manual_option(session_key=SESS1, text="MyCustomName")
         step2_service = Step2Service()
         eligible = step2_service.get_eligible_options()
         self.assertIn(option, eligible)
 
     def test_record_neither_creates_two_choices_with_null_selected(self):
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        opt_a = Option.objects.create(text="Alex", session_id="sess1")
-        opt_b = Option.objects.create(text="Pablo", session_id="sess1")
-        service.record_neither(
-            session_key="sess1",
-            option_a_id=opt_a.id,
-            option_b_id=opt_b.id,
-            ip_address="192.168.1.1"
+        opt_a = Option.objects.create(text="Alex", session_id=SESS1)
+        opt_b = Option.objects.create(text="Pablo", session_id=SESS1)
+        UserSession.objects.create(session_key=SESS1)
+        AdminConfig.get_cached()
+        with self.assertNumQueries(2):
+            self.service.record_neither(
+                session_key=SESS1,
+                option_a_id=opt_a.id,
+                option_b_id=opt_b.id,
+                ip_address=IP1
+            )
+        rejected_ids = list(
+            Choice.objects.filter(session_id=SESS1, selected__isnull=True).values_list('rejected_id', flat=True)
         )
-        choices = Choice.objects.filter(session_id="sess1", selected__isnull=True)
         with self.subTest(check="count"):
-            self.assertEqual(choices.count(), 2)
-        rejected_ids = set(choices.values_list('rejected_id', flat=True))
+            self.assertEqual(len(rejected_ids), 2)
         with self.subTest(check="rejected_ids"):
-            self.assertEqual(rejected_ids, {opt_a.id, opt_b.id})
+            self.assertEqual(set(rejected_ids), {opt_a.id, opt_b.id})
 
     def test_record_neither_increments_round_counter(self):
-        mock_adapter = MagicMock()
-        service = Step1Service(llm_adapter=mock_adapter)
-        opt_a = Option.objects.create(text="Alex", session_id="sess1")
-        opt_b = Option.objects.create(text="Pablo", session_id="sess1")
-        service.record_neither(
-            session_key="sess1",
+        opt_a = Option.objects.create(text="Alex", session_id=SESS1)
+        opt_b = Option.objects.create(text="Pablo", session_id=SESS1)
+        self.service.record_neither(
+            session_key=SESS1,
             option_a_id=opt_a.id,
             option_b_id=opt_b.id,
-            ip_address="192.168.1.1"
+            ip_address=IP1
         )
-        session = UserSession.objects.get(session_key="sess1")
+        session = UserSession.objects.get(session_key=SESS1)
         self.assertEqual(session.current_round, 1)
 
+    def test_record_neither_marks_complete_after_all_rounds(self):
+        UserSession.objects.create(session_key=SESS1, current_round=4)
+        opt_a = Option.objects.create(text="Alex", session_id=SESS1)
+        opt_b = Option.objects.create(text="Pablo", session_id=SESS1)
+        self.service.record_neither(SESS1, opt_a.id, opt_b.id, IP1)
+        session = UserSession.objects.only("is_completed", "step_completed").get(session_key=SESS1)
+        with self.subTest(field="is_completed"):
+            self.assertTrue(session.is_completed)
+        with self.subTest(field="step_completed"):
+            self.assertEqual(session.step_completed, 1)
+
     def test_get_pair_passes_rejected_history_to_llm(self):
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ("NewOpt1", "NewOpt2")
-        service = Step1Service(llm_adapter=mock_adapter)
-        opt_bad1 = Option.objects.create(text="BadOption1", session_id="sess1")
-        opt_bad2 = Option.objects.create(text="BadOption2", session_id="sess1")
-        Choice.objects.create(selected=None, rejected=opt_bad1, step=1, session_id="sess1")
-        Choice.objects.create(selected=None, rejected=opt_bad2, step=1, session_id="sess1")
-        service.get_current_pair(session_key="sess1")
-        call_args = mock_adapter.generate_options.call_args
+        self.mock_adapter.generate_options.return_value = ("NewOpt1", "NewOpt2")
+        opt_bad1 = Option.objects.create(text="BadOption1", session_id=SESS1)
+        opt_bad2 = Option.objects.create(text="BadOption2", session_id=SESS1)
+        Choice.objects.create(selected=None, rejected=opt_bad1, step=1, session_id=SESS1)
+        Choice.objects.create(selected=None, rejected=opt_bad2, step=1, session_id=SESS1)
+        self.service.get_current_pair(session_key=SESS1)
+        call_args = self.mock_adapter.generate_options.call_args
         rejected = call_args.kwargs.get('rejected') or call_args.args[2]
         with self.subTest(check="bad1"):
             self.assertIn("BadOption1", rejected)
         with self.subTest(check="bad2"):
             self.assertIn("BadOption2", rejected)
 
+    def test_get_pair_reads_history_and_rejected_in_one_query(self):
+        self.mock_adapter.generate_options.return_value = ("Maria", "Hope")
+        opt_alex = Option.objects.create(text="Alex", session_id=SESS1)
+        opt_pablo = Option.objects.create(text="Pablo", session_id=SESS1)
+        Choice.objects.create(selected=opt_alex, rejected=opt_pablo, step=1, session_id=SESS1)
+        Choice.objects.create(selected=None, rejected=opt_pablo, step=1, session_id=SESS1)
+        Option.objects.bulk_create([Option(text="MARIA"), Option(text="HOPE")])
+        self.service.get_current_pair(session_key=SESS1)
+        with self.assertNumQueries(4):
+            self.service.get_current_pair(session_key=SESS1)
+        call_args = self.mock_adapter.generate_options.call_args
+        with self.subTest(check="history"):
+            self.assertEqual(call_args.kwargs['history'], ["Alex"])
+        with self.subTest(check="rejected"):
+            self.assertEqual(call_args.kwargs['rejected'], ["Pablo"])
+
     def test_rejected_options_accumulate_across_multiple_neither_clicks(self):
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ("NewOpt", "NewOpt2")
-        service = Step1Service(llm_adapter=mock_adapter)
-        opt_a = Option.objects.create(text="Rejected1", session_id="sess1")
-        opt_b = Option.objects.create(text="Rejected2", session_id="sess1")
-        service.record_neither("sess1", opt_a.id, opt_b.id, "127.0.0.1")
-        opt_c = Option.objects.create(text="Rejected3", session_id="sess1")
-        opt_d = Option.objects.create(text="Rejected4", session_id="sess1")
-        service.record_neither("sess1", opt_c.id, opt_d.id, "127.0.0.1")
-        service.get_current_pair(session_key="sess1")
-        call_args = mock_adapter.generate_options.call_args
+        self.mock_adapter.generate_options.return_value = ("NewOpt", "NewOpt2")
+        opt_a = Option.objects.create(text="Rejected1", session_id=SESS1)
+        opt_b = Option.objects.create(text="Rejected2", session_id=SESS1)
+        self.service.record_neither(SESS1, opt_a.id, opt_b.id, "127.0.0.1")
+        opt_c = Option.objects.create(text="Rejected3", session_id=SESS1)
+        opt_d = Option.objects.create(text="Rejected4", session_id=SESS1)
+        self.service.record_neither(SESS1, opt_c.id, opt_d.id, "127.0.0.1")
+        self.service.get_current_pair(session_key=SESS1)
+        call_args = self.mock_adapter.generate_options.call_args
         rejected = call_args.kwargs.get('rejected') or call_args.args[2]
         expected = ["Rejected1", "Rejected2", "Rejected3", "Rejected4"]
         for item in expected:
@@ -473,11 +574,19 @@ class Step1ServiceTest(TestCase):
 
 
 class Step2ServiceTest(TestCase):
-    def _create_eligible_options(self, count):
-        options = [Option.objects.create(text=f"Opt{i}") for i in range(count)]
-        for opt in options:
-            other = options[0] if opt != options[0] else options[1]
-            Choice.objects.create(selected=opt, rejected=other, step=1)
+    @classmethod
+    def setUpTestData(cls):
+        cls.opt_alex = Option.objects.create(text="Alex")
+        cls.opt_pablo = Option.objects.create(text="Pablo")
+        cls.eligible_options = cls._create_eligible_options(4)
+
+    @classmethod
+    def _create_eligible_options(cls, count):
+        options = Option.objects.bulk_create([Option(text=f"Opt{i}") for i in range(count)])
+        Choice.objects.bulk_create([
+            Choice(selected=opt, rejected=options[0] if opt != options[0] else options[1], step=1)
+            for opt in options
+        ])
         return options
 
     def _select_option(self, service, session_key, pair, position):
@@ -498,12 +607,13 @@ class Step2ServiceTest(TestCase):
         return selected, rejected
 
     def test_get_eligible_options_returns_only_selected(self):
-        opt_selected = Option.objects.create(text="Alex")
-        opt_rejected = Option.objects.create(text="Pablo")
+        opt_selected = self.opt_alex
+        opt_rejected = self.opt_pablo
         opt_never_shown = Option.objects.create(text="Maria")
         Choice.objects.create(selected=opt_selected, rejected=opt_rejected, step=1)
         service = Step2Service()
-        eligible = service.get_eligible_options()
+        with self.assertNumQueries(1):
+            eligible = service.get_eligible_options()
         cases = [
             ("selected_in", opt_selected, True),
             ("rejected_not_in", opt_rejected, False),
@@ -517,93 +627,98 @@ class Step2ServiceTest(TestCase):
                     self.assertNotIn(opt, eligible)
 
     def test_total_rounds_returns_n_minus_1(self):
-        self._create_eligible_options(4)
         service = Step2Service()
         total_rounds = service.get_total_rounds()
         self.assertEqual(total_rounds, 3)
 
+    def test_eligible_options_are_fetched_once_per_service(self):
+        service = Step2Service()
+        with self.assertNumQueries(1):
+            service.get_eligible_options()
+            service.get_total_rounds()
+
     def test_first_pair_is_first_two_options(self):
-        self._create_eligible_options(4)
-        UserSession.objects.create(session_key="sess1", current_round=0)
+        UserSession.objects.create(session_key=SESS1, current_round=0)
         service = Step2Service()
-        pair = service.get_current_pair(session_key="sess1")
+        pair = service.get_current_pair(session_key=SESS1)
         eligible = service.get_eligible_options()
-        with self.subTest(position="left"):
-            self.assertEqual(pair[0], eligible[0])
-        with self.subTest(position="right"):
-            self.assertEqual(pair[1], eligible[1])
+        self.assertEqual(pair[0], eligible[0])
+        self.assertEqual(pair[1], eligible[1])
 
     def test_winner_faces_next_challenger(self):
-        self._create_eligible_options(4)
-        UserSession.objects.create(session_key="sess1", current_round=1)
+        UserSession.objects.create(session_key=SESS1, current_round=1)
         service = Step2Service()
         eligible = service.get_eligible_options()
         Choice.objects.create(
-            selected=eligible[1], rejected=eligible[0], step=2, session_id="sess1"
+            selected=eligible[1], rejected=eligible[0], step=2, session_id=SESS1
+        )
+        pair = service.get_current_pair(session_key=SESS1)
+        self.assertEqual(pair[0], eligible[1])
+        self.assertEqual(pair[1], eligible[2])
+
+    def test_next_pair_loads_options_and_last_choice_together(self):
+        eligible = self.eligible_options
+        UserSession.objects.create(session_key=SESS1, current_round=1)
+        service = Step2Service()
+        Choice.objects.create(
+            selected=eligible[1], rejected=eligible[0], step=2, session_id=SESS1
         )
-        pair = service.get_current_pair(session_key="sess1")
-        with self.subTest(position="winner"):
-            self.assertEqual(pair[0], eligible[1])
-        with self.subTest(position="challenger"):
-            self.assertEqual(pair[1], eligible[2])
+        with self.assertNumQueries(2):
+            pair = service.get_current_pair(session_key=SESS1)
+        self.assertEqual(pair, (eligible[1], eligible[2]))
 
     def test_get_current_pair_returns_pair_for_round(self):
-        self._create_eligible_options(3)
-        UserSession.objects.create(session_key="sess1", current_round=0)
+        UserSession.objects.create(session_key=SESS1, current_round=0)
         service = Step2Service()
-        pair = service.get_current_pair(session_key="sess1")
-        with self.subTest(check="not_none"):
-            self.assertIsNotNone(pair)
-        with self.subTest(check="length"):
-            self.assertEqual(len(pair), 2)
+        pair = service.get_current_pair(session_key=SESS1)
+        self.assertIsNotNone(pair)
+        self.assertEqual(len(pair), 2)
 
     def test_record_selection_creates_step2_choice(self):
-        opt_a = Option.objects.create(text="Alex")
-        opt_b = Option.objects.create(text="Pablo")
+        opt_a = self.opt_alex
+        opt_b = self.opt_pablo
         service = Step2Service()
         service.record_selection(
-            session_key="sess1",
+            session_key=SESS1,
             selected_id=opt_a.id,
             rejected_id=opt_b.id,
-            ip_address="192.168.1.1"
+            ip_address=IP1
         )
-        choice = Choice.objects.get(session_id="sess1", step=2)
-        with self.subTest(field="selected"):
-            self.assertEqual(choice.selected, opt_a)
-        with self.subTest(field="rejected"):
-            self.assertEqual(choice.rejected, opt_b)
+        choice = Choice.objects.select_related("selected", "rejected").get(session_id=SESS1, step=2)
+        self.assertEqual(choice.selected, opt_a)
+        self.assertEqual(choice.rejected, opt_b)
 
     def test_get_streak_stats_for_session(self):
-        opt_a = Option.objects.create(text="Alex")
-        opt_b = Option.objects.create(text="Pablo")
+        opt_a = self.opt_alex
+        opt_b = self.opt_pablo
         opt_c = Option.objects.create(text="Maria")
-        Choice.objects.create(selected=opt_a, rejected=opt_b, step=2, session_id="sess1")
-        Choice.objects.create(selected=opt_a, rejected=opt_c, step=2, session_id="sess1")
-        Choice.objects.create(selected=opt_a, rejected=opt_b, step=2, session_id="sess1")
+        Choice.objects.bulk_create([
+            Choice(selected=opt_a, rejected=opt_b, step=2, session_id=SESS1),
+            Choice(selected=opt_a, rejected=opt_c, step=2, session_id=SESS1),
+            Choice(selected=opt_a, rejected=opt_b, step=2, session_id=SESS1),
+        ])
         service = Step2Service()
-        stats = service.get_streak_stats(session_key="sess1")
-        with self.subTest(field="option"):
-            self.assertEqual(stats['longest_streak_option'], opt_a)
-        with self.subTest(field="count"):
-            self.assertEqual(stats['longest_streak_count'], 3)
+        with self.assertNumQueries(1):
+            stats = service.get_streak_stats(session_key=SESS1)
+        self.assertEqual(stats['longest_streak_option'], opt_a)
+        self.assertEqual(stats['longest_streak_count'], 3)
 
     def test_get_final_winner(self):
-        opt_a = Option.objects.create(text="Alex")
-        opt_b = Option.objects.create(text="Pablo")
-        Choice.objects.create(selected=opt_a, rejected=opt_b, step=2, session_id="sess1")
-        Choice.objects.create(selected=opt_b, rejected=opt_a, step=2, session_id="sess1")
+        opt_a = self.opt_alex
+        opt_b = self.opt_pablo
+        Choice.objects.bulk_create([
+            Choice(selected=opt_a, rejected=opt_b, step=2, session_id=SESS1),
+            Choice(selected=opt_b, rejected=opt_a, step=2, session_id=SESS1),
+        ])
         service = Step2Service()
-        final = service.get_final_winner(session_key="sess1")
+        final = service.get_final_winner(session_key=SESS1)
         self.assertEqual(final, opt_b)
 
     def test_selected_option_continues_to_next_round(self):
-        self._create_eligible_options(3)
         service = Step2Service()
         variants = ['left', 'right']
         for position in variants:
             with self.subTest(select=position):
-                Choice.objects.filter(step=2).delete()
-                UserSession.objects.all().delete()
                 session_key = f"sess_{position}"
                 pair1 = service.get_current_pair(session_key=session_key)
                 self.assertIsNotNone(pair1)
@@ -615,7 +730,6 @@ class Step2ServiceTest(TestCase):
                 self.assertNotIn(rejected, [next_left, next_right])
 
     def test_winner_preserves_position(self):
-        self._create_eligible_options(3)
         service = Step2Service()
         variants = [
             {'position': 'left', 'expected_index': 0},
@@ -623,8 +737,6 @@ class Step2ServiceTest(TestCase):
         ]
         for variant in variants:
             with self.subTest(select=variant['position']):
-                Choice.objects.filter(step=2).delete()
-                UserSession.objects.all().delete()
                 session_key = f"sess_{variant['position']}"
                 pair1 = service.get_current_pair(session_key=session_key)
                 selected, _ = self._select_option(service, session_key, pair1, variant['position'])
@@ -632,30 +744,33 @@ class Step2ServiceTest(TestCase):
                 self.assertEqual(pair2[variant['expected_index']], selected)
 
 
+@patch('selector.views.get_llm_adapter', new=lambda: _FAKE_ADAPTER)
 class MainViewTest(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         AdminConfig.objects.create(
             prompt="Domain: mascot names",
             current_step=1,
             rounds_count=5
         )
 
+    def setUp(self):
+        cache.clear()
+
     def test_redirects_to_disabled_when_step_0(self):
         config = AdminConfig.objects.first()
         config.current_step = 0
         config.save()
-        response = self.client.get('/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/')
         self.assertRedirects(response, '/disabled/')
 
     def test_shows_step1_interface_when_step_1(self):
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ("Alex", "Pablo")
-        with patch('selector.views.get_llm_adapter', return_value=mock_adapter):
-            response = self.client.get('/')
-            with self.subTest(check="status"):
-                self.assertEqual(response.status_code, 200)
-            with self.subTest(check="template"):
-                self.assertTemplateUsed(response, 'selector/selection.html')
+        response = self.client.get('/')
+        with self.subTest(check="status"):
+            self.assertEqual(response.status_code, 200)
+        with self.subTest(check="template"):
+            self.assertTemplateUsed(response, 'selector/selection.html')
 
     def test_shows_step2_interface_when_step_2(self):
         config = AdminConfig.objects.first()
@@ -665,7 +780,8 @@ class MainViewTest(TestCase):
         opt_b = Option.objects.create(text="Pablo")
         Choice.objects.create(selected=opt_a, rejected=opt_b, step=1)
         Choice.objects.create(selected=opt_b, rejected=opt_a, step=1)
-        response = self.client.get('/')
+        with self.assertNumQueries(13):
+            response = self.client.get('/')
         with self.subTest(check="status"):
             self.assertEqual(response.status_code, 200)
         with self.subTest(check="template"):
@@ -679,18 +795,61 @@ class MainViewTest(TestCase):
             is_completed=True,
             step_completed=1
         )
-        response = self.client.get('/')
+        with self.assertNumQueries(2):
+            response = self.client.get('/')
         self.assertRedirects(response, '/complete/')
 
+    def test_marks_session_completed_when_no_pair_left(self):
+        config = AdminConfig.objects.first()
+        config.current_step = 2
+        config.save()
+        response = self.client.get('/')
+        user_session = UserSession.objects.get(session_key=self.client.session.session_key)
+        with self.subTest(check="redirect"):
+            self.assertRedirects(response, '/complete/', fetch_redirect_response=False)
+        with self.subTest(field="is_completed"):
+            self.assertTrue(user_session.is_completed)
+        with self.subTest(field="step_completed"):
+            self.assertEqual(user_session.step_completed, 2)
 
+
+class AdminConfigMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_loads_config_only_when_accessed(self):
+        AdminConfig.objects.create(prompt="test", current_step=1)
+        request = RequestFactory().get('/')
+        with self.subTest(check="lazy"):
+            with self.assertNumQueries(0):
+                AdminConfigMiddleware(lambda request: HttpResponse())(request)
+        with self.subTest(check="resolved"):
+            with self.assertNumQueries(1):
+                self.assertEqual(request.admin_config.current_step, 1)
+
+
+class GetLLMAdapterTest(SimpleTestCase):
+    @override_settings(OPENAI_API_KEY="test-key", OPENAI_MODEL="gpt-4o-mini")
+    def test_reuses_adapter_for_same_settings(self):
+        self.assertIs(get_llm_adapter(), get_llm_adapter())
+
+    def test_builds_new_adapter_when_settings_change(self):
+        with override_settings(OPENAI_API_KEY="test-key", OPENAI_MODEL="gpt-4o-mini"):
+            first = get_llm_adapter()
+        with override_settings(OPENAI_API_KEY="test-key", OPENAI_MODEL="gpt-4o"):
+            second = get_llm_adapter()
+        with self.subTest(check="new_instance"):
+            self.assertIsNot(first, second)
+        with self.subTest(check="model"):
+            self.assertEqual(second.model, "gpt-4o")
+
+
+@patch('selector.views.get_llm_adapter', new=lambda: _FAKE_ADAPTER)
 class DisabledViewRedirectTest(TestCase):
     def test_redirects_to_main_when_step_enabled(self):
         AdminConfig.objects.create(prompt="test", current_step=1, rounds_count=5)
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ("A", "B")
-        with patch('selector.views.get_llm_adapter', return_value=mock_adapter):
-            response = self.client.get('/disabled/')
-            self.assertRedirects(response, '/')
+        response = self.client.get('/disabled/')
+        self.assertRedirects(response, '/')
 
     def test_stays_on_disabled_when_step_0(self):
         AdminConfig.objects.create(prompt="test", current_step=0)
@@ -698,17 +857,76 @@ class DisabledViewRedirectTest(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
-class NeitherViewTest(TestCase):
+@patch('selector.views.get_llm_adapter', new=lambda: _FAKE_ADAPTER)
+class SelectViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        AdminConfig.objects.create(prompt="test", current_step=2, rounds_count=5)
+        cls.opt_alex = Option.objects.create(text="Alex")
+        cls.opt_pablo = Option.objects.create(text="Pablo")
+
     def setUp(self):
+        cache.clear()
+        session = self.client.session
+        session.save()
+
+    def test_records_selected_position(self):
+        positions = [("0", Choice.POSITION_LEFT), ("1", Choice.POSITION_RIGHT), ("", None)]
+        for position, expected in positions:
+            with self.subTest(position=position):
+                self.client.post('/select/', {
+                    'selected': self.opt_alex.id,
+                    'rejected': self.opt_pablo.id,
+                    'position': position
+                })
+                choice = Choice.objects.filter(step=2).latest('id')
+                self.assertEqual(choice.selected_position, expected)
+
+    def test_records_first_forwarded_client_ip(self):
+        self.client.post('/select/', {
+            'selected': self.opt_alex.id,
+            'rejected': self.opt_pablo.id,
+            'position': '0'
+        }, HTTP_X_FORWARDED_FOR=' 203.0.113.5 , 10.0.0.1')
+        choice = Choice.objects.get(step=2)
+        self.assertEqual(choice.ip_address, '203.0.113.5')
+
+
+class SubmitManualViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
         AdminConfig.objects.create(prompt="test", current_step=1, rounds_count=5)
 
+    def setUp(self):
+        cache.clear()
+
+    def test_blank_text_redirects_without_touching_config_or_adapter(self):
+        with patch('selector.views.get_llm_adapter') as mock_get_adapter:
+            with self.assertNumQueries(0):
+                response = self.client.post('/submit-manual/', {'text': '   '})
+        with self.subTest(check="redirect"):
+            self.assertEqual(response.url, '/')
+        with self.subTest(check="adapter"):
+            mock_get_adapter.assert_not_called()
+
+
+@patch('selector.views.get_llm_adapter', new=lambda: _FAKE_ADAPTER)
+class NeitherViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        AdminConfig.objects.create(prompt="test", current_step=1, rounds_count=5)
+
+    def setUp(self):
+        cache.clear()
+
     def test_neither_view_records_rejection_and_redirects(self):
         opt_a = Option.objects.create(text="Alex")
         opt_b = Option.objects.create(text="Pablo")
-        response = self.client.post('/neither/', {
-            'option_a': opt_a.id,
-            'option_b': opt_b.id
-        })
+        with self.assertNumQueries(13):
+            response = self.client.post('/neither/', {
+                'option_a': opt_a.id,
+                'option_b': opt_b.id
+            })
         with self.subTest(check="redirect"):
             self.assertRedirects(response, '/')
         choices = Choice.objects.filter(selected__isnull=True)
@@ -716,11 +934,8 @@ class NeitherViewTest(TestCase):
             self.assertEqual(choices.count(), 2)
 
     def test_neither_button_shown_in_step1(self):
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ("Alex", "Pablo")
-        with patch('selector.views.get_llm_adapter', return_value=mock_adapter):
-            response = self.client.get('/')
-            self.assertContains(response, '/neither/')
+        response = self.client.get('/')
+        self.assertContains(response, '/neither/')
 
     def test_neither_button_not_shown_in_step2(self):
         config = AdminConfig.objects.first()
@@ -734,19 +949,22 @@ class NeitherViewTest(TestCase):
         self.assertNotContains(response, '/neither/')
 
 
+@patch('selector.views.get_llm_adapter', new=lambda: _FAKE_ADAPTER)
 class CompleteViewRedirectTest(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         AdminConfig.objects.create(prompt="test", current_step=1, rounds_count=5)
 
+    def setUp(self):
+        cache.clear()
+
     def test_redirects_to_main_when_session_incomplete(self):
         session = self.client.session
         session.save()
         UserSession.objects.create(session_key=session.session_key, is_completed=False)
-        mock_adapter = MagicMock()
-        mock_adapter.generate_options.return_value = ("A", "B")
-        with patch('selector.views.get_llm_adapter', return_value=mock_adapter):
+        with self.assertNumQueries(2):
             response = self.client.get('/complete/')
-            self.assertRedirects(response, '/')
+        self.assertRedirects(response, '/')
 
     def test_redirects_to_main_when_step_changed(self):
         session = self.client.session
@@ -774,5 +992,73 @@ class CompleteViewRedirectTest(TestCase):
             is_completed=True,
             step_completed=1
         )
-        response = self.client.get('/complete/')
+        with self.assertNumQueries(2):
+            response = self.client.get('/complete/')
         self.assertEqual(response.status_code, 200)
+
+
+class OptionAdminResultsTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(user)
+
+    def test_step2_streak_view_groups_choices_by_session(self):
+        opt_a = Option.objects.create(text="Alex")
+        opt_b = Option.objects.create(text="Pablo")
+        opt_c = Option.objects.create(text="Maria")
+        Choice.objects.create(selected=opt_a, rejected=opt_b, step=2, session_id=SESS1)
+        Choice.objects.create(selected=opt_a, rejected=opt_c, step=2, session_id=SESS1)
+        Choice.objects.create(selected=opt_b, rejected=opt_a, step=2, session_id="sess2")
+        Choice.objects.create(selected=opt_c, rejected=opt_b, step=2, session_id="sess2")
+        Choice.objects.create(selected=opt_a, rejected=opt_c, step=2, session_id="sess3")
+        response = self.client.get('/admin/selector/option/results/step2-streak/')
+        results = [
+            (item['option'], item['max_streak'], item['sessions'])
+            for item in response.context['results']
+        ]
+        self.assertEqual(results, [(opt_a, 2, 2), (opt_b, 1, 1)])
+
+    def test_step2_final_view_counts_last_choice_per_session(self):
+        opt_a = Option.objects.create(text="Alex")
+        opt_b = Option.objects.create(text="Pablo")
+        Choice.objects.create(selected=opt_a, rejected=opt_b, step=2, session_id=SESS1)
+        Choice.objects.create(selected=opt_b, rejected=opt_a, step=2, session_id=SESS1)
+        Choice.objects.create(selected=opt_b, rejected=opt_a, step=2, session_id="sess2")
+        Choice.objects.create(selected=opt_a, rejected=opt_b, step=2, session_id="sess3")
+        response = self.client.get('/admin/selector/option/results/step2-final/')
+        results = [(item['option'], item['count']) for item in response.context['results']]
+        self.assertEqual(results, [(opt_b, 2), (opt_a, 1)])
+
+    def test_step2_final_view_breaks_timestamp_ties_by_id(self):
+        opt_a = Option.objects.create(text="Alex")
+        opt_b = Option.objects.create(text="Pablo")
+        first = Choice.objects.create(selected=opt_a, rejected=opt_b, step=2, session_id=SESS1)
+        second = Choice.objects.create(selected=opt_b, rejected=opt_a, step=2, session_id=SESS1)
+        Choice.objects.filter(pk=second.pk).update(created_at=first.created_at)
+        response = self.client.get('/admin/selector/option/results/step2-final/')
+        results = [(item['option'], item['count']) for item in response.context['results']]
+        self.assertEqual(results, [(opt_b, 1)])
+
+    def test_step2_final_view_paginates_results(self):
+        opt_a = Option.objects.create(text="Alex")
+        opt_b = Option.objects.create(text="Pablo")
+        Choice.objects.create(selected=opt_a, rejected=opt_b, step=2, session_id=SESS1)
+        Choice.objects.create(selected=opt_a, rejected=opt_b, step=2, session_id="sess2")
+        Choice.objects.create(selected=opt_b, rejected=opt_a, step=2, session_id="sess3")
+        response = self.client.get('/admin/selector/option/results/step2-final/?limit=1&page=2')
+        results = [(item['option'], item['count']) for item in response.context['results']]
+        with self.subTest(check="page"):
+            self.assertEqual(results, [(opt_b, 1)])
+        with self.subTest(check="rank"):
+            self.assertContains(response, '<td>2</td>', html=True)
+
+    def test_step1_popularity_view_counts_selections_from_filtered_ip(self):
+        opt_a = Option.objects.create(text="Alex")
+        opt_b = Option.objects.create(text="Pablo")
+        Choice.objects.create(selected=opt_a, rejected=opt_b, step=1, ip_address="10.0.0.1")
+        Choice.objects.create(selected=opt_a, rejected=opt_b, step=1, ip_address="10.0.0.2")
+        Choice.objects.create(selected=opt_b, rejected=opt_a, step=1, ip_address="10.0.0.2")
+        Choice.objects.create(selected=opt_b, rejected=opt_a, step=2, ip_address="10.0.0.2")
+        response = self.client.get('/admin/selector/option/results/step1/?ip=10.0.0.2')
+        results = [(opt, opt.count) for opt in response.context['options']]
+        self.assertEqual(results, [(opt_a, 1), (opt_b, 1)])
@@ -1,45 +1,51 @@
+from functools import lru_cache
+
 from django.conf import settings
 from django.shortcuts import render, redirect
 
 from selector.llm import OpenAIAdapter
-from selector.models import AdminConfig, UserSession
+from selector.models import UserSession
 from selector.services import Step1Service, Step2Service
 
 
+@lru_cache(maxsize=1)
+def _get_openai_adapter(api_key, model):
+    return OpenAIAdapter(api_key=api_key, model=model)
+
+
 def get_llm_adapter():
-    return OpenAIAdapter(
-        api_key=settings.OPENAI_API_KEY,
-        model=settings.OPENAI_MODEL
-    )
+    return _get_openai_adapter(settings.OPENAI_API_KEY, settings.OPENAI_MODEL)
 
 
-def _mark_session_completed(user_session, step):
-    user_session.is_completed = True
-    user_session.step_completed = step
-    user_session.save()
+def _mark_session_completed(session_key, step):
+    UserSession.objects.filter(session_key=session_key).update(is_completed=True, step_completed=step)
 
 
 def _get_pair_for_step(config, session_key):
     if config.current_step == 1:
-        service = Step1Service(llm_adapter=get_llm_adapter())
+        service = Step1Service(llm_adapter=get_llm_adapter(), config=config)
     else:
         service = Step2Service()
     return service.get_current_pair(session_key=session_key)
 
 
 def main_view(request):
-    config = AdminConfig.objects.first()
+    config = request.admin_config
     if not config or config.current_step == 0:
         return redirect('disabled')
-    if not request.session.session_key:
-        request.session.create()
     session_key = request.session.session_key
-    user_session, _ = UserSession.objects.get_or_create(session_key=session_key)
-    if user_session.is_completed and user_session.step_completed == config.current_step:
-        return redirect('complete')
+    if session_key:
+        completed = UserSession.objects.filter(
+            session_key=session_key, is_completed=True, step_completed=config.current_step
+        ).exists()
+        if completed:
+            return redirect('complete')
+    else:
+        request.session.create()
+        session_key = request.session.session_key
     pair = _get_pair_for_step(config, session_key)
     if not pair:
-        _mark_session_completed(user_session, config.current_step)
+        _mark_session_completed(session_key, config.current_step)
         return redirect('complete')
     opt_a, opt_b = pair
     return render(request, 'selector/selection.html', {
@@ -51,14 +57,14 @@ def main_view(request):
 
 
 def disabled_view(request):
-    config = AdminConfig.objects.first()
+    config = request.admin_config
     if config and config.current_step != 0:
         return redirect('main')
     return render(request, 'selector/disabled.html')
 
 
 def complete_view(request):
-    config = AdminConfig.objects.first()
+    config = request.admin_config
     if not config or config.current_step == 0:
         return redirect('disabled')
     if not request.session.session_key:
@@ -75,14 +81,15 @@ def complete_view(request):
 def _get_client_ip(request):
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
     if x_forwarded_for:
-        return x_forwarded_for.split(',')[0]
+        return x_forwarded_for.partition(',')[0].strip()
     return request.META.get('REMOTE_ADDR')
 
 
 def _parse_selection_from_post(request):
-    selected_id = int(request.POST.get('selected'))
-    rejected_id = int(request.POST.get('rejected'))
-    position = request.POST.get('position')
+    post = request.POST
+    selected_id = int(post['selected'])
+    rejected_id = int(post['rejected'])
+    position = post.get('position', '').strip()
     selected_position = int(position) if position else None
     return selected_id, rejected_id, selected_position
 
@@ -90,14 +97,14 @@ def _parse_selection_from_post(request):
 def select_view(request):
     if request.method != 'POST':
         return redirect('main')
-    config = AdminConfig.objects.first()
+    config = request.admin_config
     if not config or config.current_step == 0:
         return redirect('disabled')
     session_key = request.session.session_key
     selected_id, rejected_id, selected_position = _parse_selection_from_post(request)
     ip_address = _get_client_ip(request)
     if config.current_step == 1:
-        service = Step1Service(llm_adapter=get_llm_adapter())
+        service = Step1Service(llm_adapter=get_llm_adapter(), config=config)
         service.record_selection(session_key, selected_id, rejected_id, ip_address)
     else:
         service = Step2Service()
@@ -108,21 +115,21 @@ def select_view(request):
 def submit_manual_view(request):
     if request.method != 'POST':
         return redirect('main')
-    config = AdminConfig.objects.first()
+    text = request.POST.get('text', '').strip()
+    if not text:
+        return redirect('main')
+    config = request.admin_config
     if not config or config.current_step != 1:
         return redirect('main')
-    session_key = request.session.session_key
-    text = request.POST.get('text', '').strip()
-    if text:
-        service = Step1Service(llm_adapter=get_llm_adapter())
-        service.submit_manual_option(session_key, text)
+    service = Step1Service(llm_adapter=get_llm_adapter(), config=config)
+    service.submit_manual_option(request.session.session_key, text)
     return redirect('main')
 
 
 def neither_view(request):
     if request.method != 'POST':
         return redirect('main')
-    config = AdminConfig.objects.first()
+    config = request.admin_config
     if not config or config.current_step != 1:
         return redirect('main')
     if not request.session.session_key:
@@ -131,6 +138,6 @@ def neither_view(request):
     option_a_id = int(request.POST.get('option_a'))
     option_b_id = int(request.POST.get('option_b'))
     ip_address = _get_client_ip(request)
-    service = Step1Service(llm_adapter=get_llm_adapter())
+    service = Step1Service(llm_adapter=get_llm_adapter(), config=config)
     service.record_neither(session_key, option_a_id, option_b_id, ip_address)
     return redirect('main')